@@ -88,8 +88,8 @@ class TestGetCurrentUnionFs:
         """Test detecting AUFS from kernel command line."""
         from minios_session import SessionManager
         
-        cmdline = "BOOT_IMAGE=/minios/boot/vmlinuz union=aufs"
-        
+        cmdline = b"BOOT_IMAGE=/minios/boot/vmlinuz union=aufs"
+
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open(read_data=cmdline)):
             sm = SessionManager(custom_sessions_dir=temp_sessions_dir)
@@ -100,8 +100,8 @@ class TestGetCurrentUnionFs:
         """Test detecting OverlayFS from kernel command line."""
         from minios_session import SessionManager
         
-        cmdline = "BOOT_IMAGE=/minios/boot/vmlinuz union=overlayfs"
-        
+        cmdline = b"BOOT_IMAGE=/minios/boot/vmlinuz union=overlayfs"
+
         with patch('os.path.exists', return_value=True), \
              patch('builtins.open', mock_open(read_data=cmdline)):
             sm = SessionManager(custom_sessions_dir=temp_sessions_dir)
@@ -113,10 +113,11 @@ class TestGetCurrentUnionFs:
         from minios_session import SessionManager
         
         cmdline = "BOOT_IMAGE=/minios/boot/vmlinuz"  # No union= parameter
-        
+
+        # Proc files are opened in binary mode
         files = {
-            '/proc/cmdline': cmdline,
-            '/proc/filesystems': mock_proc_filesystems
+            '/proc/cmdline': cmdline.encode(),
+            '/proc/filesystems': mock_proc_filesystems.encode()
         }
         
         def mock_open_func(path, *args, **kwargs):
@@ -251,6 +252,24 @@ class TestReadSessionsMetadata:
             assert metadata == {"default": None, "sessions": {}}
 
 
+class TestUnescapeMountField:
+    """Tests for the /proc/mounts field unescaping helper."""
+
+    def test_octal_escapes_expanded(self):
+        """Test kernel octal escapes are expanded to their characters."""
+        from minios_session import _unescape_mount_field
+
+        assert _unescape_mount_field(rb'/media/user/My\040Disk') == '/media/user/My Disk'
+        assert _unescape_mount_field(rb'/a\011b\012c\134d') == '/a\tb\nc\\d'
+
+    def test_utf8_bytes_pass_through(self):
+        """Test multibyte UTF-8 mount points survive unescaping intact."""
+        from minios_session import _unescape_mount_field
+
+        label = '/media/user/Новый'
+        assert _unescape_mount_field(label.encode('utf-8')) == label
+
+
 class TestCheckSessionsDirectoryStatus:
     """Tests for check_sessions_directory_status method."""
 